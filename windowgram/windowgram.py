@@ -53,6 +53,8 @@ OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMA
 
 import sys, argparse, re, math, copy, inspect, operator
 
+from .windowgram_layout import *    # Kept apart, so that the hook of tmuxomatic --resize loads nothing else
+
 
 
 ##----------------------------------------------------------------------------------------------------------------------
@@ -122,6 +124,7 @@ def SplitProcessor_SplitWindow( sw, dim, at_linkid, linkid, list_split, list_lin
             list_links[llx] = ( llit[0], llit[1]+1 ) # Shift the index to accommodate new pane
     linkid[0] += 1
     this_ent = {}
+    of_windowgram = of_this # Size in definition, kept for rebuilding the layout at other screen sizes
 
     # The dimensions for the newly created window are based on the parent (accounts for the one character divider)
     for ent in list_split:
@@ -133,19 +136,14 @@ def SplitProcessor_SplitWindow( sw, dim, at_linkid, linkid, list_split, list_lin
             of_this = translate( of_this, dim['win'][1], dim['scr'][1] ) # From size-in-definition to size-on-screen
             w = this_ent['inst_w']
             h = of_this - 1
-            per = str( float(of_this) / float(this_ent['inst_h']) * 100.0 )
-            if sw['relative']:
-                this_ent['inst_h'] = int(this_ent['inst_h']) - of_this # Subtract split from root pane
         else: # elif how == 'h':
             of_this = translate( of_this, dim['win'][0], dim['scr'][0] ) # From size-in-definition to size-on-screen
             w = of_this - 1
             h = this_ent['inst_h']
-            per = str( float(of_this) / float(this_ent['inst_w']) * 100.0 )
-            if sw['relative']:
-                this_ent['inst_w'] = int(this_ent['inst_w']) - of_this # Subtract split from root pane
 
     # Split list tracks tmux pane number at the time of split (for building the split commands)
-    list_split.append( { 'linkid':linkid[0], 'tmux':at_tmux, 'split':how, 'inst_w':w, 'inst_h':h, 'per':per } )
+    list_split.append( { 'linkid':linkid[0], 'tmux':at_tmux, 'split':how, 'inst_w':w, 'inst_h':h, 'at':at_linkid,
+        'of':of_windowgram } )
 
     # Now add the new window's pane id, this is shifted up as insertions below it occur (see above)
     at_tmux += 1
@@ -325,8 +323,9 @@ def SplitProcessor( sw, wg, iw, ih, list_panes ): # list_split, list_links
     # window is fully divided to get the final pane index for a particular pane.  This is an essential link
     # because panes are renumbered as splits occur, and before they're assigned to tmuxomatic pane ids.
     # Note: 'inst_w' and 'inst_h' are the dimensions when split, the first pane uses full dimensions.
-    # Note: The first pane does not use the entires 'split' or 'tmux'.
-    list_split = [ { 'linkid': linkid[0], 'split': "", 'tmux': 65536, 'inst_w': iw, 'inst_h': ih, 'per': "100.0" } ]
+    # Note: The first pane does not use the entires 'split', 'tmux', 'at', or 'of'.
+    list_split = [ { 'linkid': linkid[0], 'split': "", 'tmux': 65536, 'inst_w': iw, 'inst_h': ih, 'at': None,
+        'of': None } ]
     list_links = [ ( linkid[0], 0 ) ]   # List of cross-references (linkid, pane_tmux)
     # Run the recursive splitter
     windowgram_w, windowgram_h = wg.Analyze_WidthHeight() # TODO: Clean up remaining wg inlines
@@ -338,6 +337,119 @@ def SplitProcessor( sw, wg, iw, ih, list_panes ): # list_split, list_links
     # Return useful elements
     return list_split, list_links
 
+def SplitProcessor_Percentages( list_split, ww, wh, iw, ih ): # percentages
+    """
+
+    Sizes the splits of a window by percentage, for "split-window -p" at the specified screen size
+
+    The splits are replayed as tmux performs them, where the new pane is the percentage of the split pane rounded down,
+    and the split pane keeps the remainder less the divider.  Each split is aimed at the screen position of its edge in
+    the windowgram, and later splits continue from the sizes that tmux actually makes, so the rounding of nested splits
+    does not accumulate.  Percentages are integers, as required by tmux 1.8.
+
+    Returns the percentage of each split (the first pane has none).  If the screen is too small for a pane, returns
+    None.
+
+    """
+
+    def edge( position, window, screen ):
+        # Returns the screen position of an edge in the windowgram
+        return int( float(position) / float(window) * float(screen) + 0.5 )
+
+    # Replay the splits, each pane is ( windowgram start, windowgram end, screen start, screen size ) along both axes
+    panes = { list_split[0]['linkid']: { 'w': ( 0, ww, 0, iw ), 'h': ( 0, wh, 0, ih ) } }
+    percentages = []
+    for split in list_split[1:]:
+        cell = panes[split['at']]
+        axis = 'w' if split['split'] == 'h' else 'h'
+        begin, end, start, size = cell[axis]
+        position = end - split['of'] # Windowgram position of the new pane's edge
+        target = start + size - edge( position, ww if axis == 'w' else wh, iw if axis == 'w' else ih ) - 1
+        # The percentage that comes closest to the target, checked against the rounding down by tmux
+        percentage = min( max( ( target * 100 + size - 1 ) // size, 1 ), 99 ) if size > 0 else 1
+        below = abs( size * ( percentage - 1 ) // 100 - target )
+        if percentage > 1 and below <= abs( size * percentage // 100 - target ): percentage -= 1
+        size_new = size * percentage // 100
+        size_old = size - 1 - size_new
+        if size_new < 1 or size_old < 1: return None
+        new = dict( cell )
+        cell[axis] = ( begin, position, start, size_old )
+        new[axis] = ( position, end, start + size_old + 1, size_new )
+        panes[split['linkid']] = new
+        percentages.append( percentage )
+    return percentages
+
+def SplitProcessor_Create( count, iw, ih ): # splits, made
+    """
+
+    Plans the creation of panes for a layout that is applied afterwards, using tmux splits without a size
+
+    The largest pane is split in half each time, across its longer side (characters are about twice as tall as they
+    are wide), so no pane is made smaller than necessary.  The sizes follow tmux, where the new pane is right or below.
+
+    Returns the splits as ( pane index at the time of split, 'v' or 'h' ), and for each pane in index order, the number
+    of the split that made it (0 for the first pane).  If the screen is too small for all panes, splits is None.
+
+    """
+
+    panes = [ ( iw, ih, 0 ) ] # ( w, h, made ) in pane index order
+    splits = []
+    for made in range( 1, count ):
+        ix = max( range(len(panes)), key=lambda ix: panes[ix][0] * panes[ix][1] )
+        w, h, made_pane = panes[ix]
+        how = 'h' if w > h * 2 else 'v'
+        if ( w if how == 'h' else h ) < 3: how = 'v' if how == 'h' else 'h'
+        size = w if how == 'h' else h
+        if size < 3: return None, []
+        size_new = ( size + 1 ) // 2 - 1
+        size_old = size - 1 - size_new
+        if how == 'h': panes[ix:ix+1] = [ ( size_old, h, made_pane ), ( size_new, h, made ) ]
+        else: panes[ix:ix+1] = [ ( w, size_old, made_pane ), ( w, size_new, made ) ]
+        splits.append( ( ix, how ) )
+    return splits, [ made for _, _, made in panes ]
+
+def SplitProcessor_Capture( list_panes, iw, ih, resolution ): # windowgram_string, paneids
+    """
+
+    The inverse of the split processor, makes a windowgram from the panes of a tmux window at the screen size (iw, ih)
+
+    Each pane is ( x, y, w, h ) from zero, as tmux reports them.  A pane owns the divider on its right and below, so
+    the panes tile a screen that is one character larger on each axis.  Each axis is scaled to the smallest length that
+    keeps every pane, and puts every edge within a character of the screen, or within half a windowgram character at
+    the resolution if that's more.  At worst this is the screen size.  When the edges share a divisor, the length is
+    reduced by it, so the windowgram is as small as the layout allows.
+
+    Returns the windowgram, and the pane id of each pane.  Pane ids are given in reading order from "1", as in a new
+    windowgram.  If there are too many panes, the windowgram is None.
+
+    """
+
+    def axis( starts, ends, screen ): # { edge: position }
+        # Returns the windowgram position of each edge along one axis
+        edges = sorted( set( [ 0, screen + 1 ] + starts + ends ) )
+        length = screen + 1
+        tolerance = max( 1.0, float(length) / float(resolution) / 2.0 )
+        for scale in range( 1, length + 1 ):
+            positions = [ int( float(edge) / float(length) * float(scale) + 0.5 ) for edge in edges ]
+            if len(set(positions)) == len(edges) and all([ abs( float(position) / float(scale) * float(length) - edge )
+                    <= tolerance for edge, position in zip( edges, positions ) ]):
+                break
+        return dict( zip( edges, positions ) )
+
+    if len(list_panes) > MAXIMUM_PANES: return None, []
+    xs = axis( [ x for x, y, w, h in list_panes ], [ x + w + 1 for x, y, w, h in list_panes ], iw )
+    ys = axis( [ y for x, y, w, h in list_panes ], [ y + h + 1 for x, y, w, h in list_panes ], ih )
+    characters = PANE_CHARACTERS[1:10] + PANE_CHARACTERS[:1] + PANE_CHARACTERS[10:]
+    order = sorted( range(len(list_panes)), key=lambda ix: ( list_panes[ix][1], list_panes[ix][0] ) )
+    windowgram_parsed = {}
+    paneids = [ None ] * len(list_panes)
+    for paneid, ix in zip( characters, order ):
+        x, y, w, h = list_panes[ix]
+        windowgram_parsed[paneid] = { 'n': paneid, 'x': xs[x] + 1, 'y': ys[y] + 1,
+            'w': xs[x + w + 1] - xs[x], 'h': ys[y + h + 1] - ys[y] }
+        paneids[ix] = paneid
+    return Windowgram_Convert.Parsed_To_String( windowgram_parsed ), paneids
+
 
 
 ##----------------------------------------------------------------------------------------------------------------------
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+##----------------------------------------------------------------------------------------------------------------------
+##
+## Name ....... windowgram_layout
+## Synopsis ... Layout of split windows for tmux, part of the windowgram module
+## Author ..... Oxidane
+## License .... (To Be Determined), see the windowgram source
+##
+##---------------+------------------------------------------------------------------------------------------------------
+##     About     |
+##---------------+
+##
+## The split processor builds the splits of a window from its windowgram.  These functions lay out the splits at any
+## screen size, and pack them into a short string that's kept in the window.  They depend on nothing else in windowgram.
+##
+## When a client is resized, tmuxomatic (--resize) lays out the windows it built again at the new size.  This is done by
+## a tmux hook that runs this file as a script, so that only this file and the standard library are loaded, not the
+## windowgram module or tmuxomatic.  One tmux call gets every window, and one tmux call applies a select-layout to each.
+##
+##----------------------------------------------------------------------------------------------------------------------
+
+import sys, re, subprocess
+
+
+
+##----------------------------------------------------------------------------------------------------------------------
+##
+## Layout of split windows
+##
+##----------------------------------------------------------------------------------------------------------------------
+
+def SplitProcessor_Layout( list_split, ww, wh, iw, ih ): # layout, order
+    """
+
+    Builds the tmux layout of a split window at the specified screen size, as a string for "select-layout"
+
+    The splits are replayed the way tmux performs them.  A split pane is replaced by a cell containing the pane and its
+    new pane, or if the pane is already in a cell split along the same axis, the new pane is added to that cell.  The
+    new pane's size is scaled from the windowgram (ww, wh) to the screen (iw, ih), as it is by the split processor.
+
+    Returns the layout with its checksum, and the linkids of the panes in the order that tmux assigns them (pane index
+    order).  If the screen is too small for a pane, the layout is None.
+
+    """
+
+    def translate( pane, window, screen ):
+        # Returns scaled pane according to windowgram and screen dimensions
+        return int( float(pane) / float(window) * float(screen) )
+
+    # Replay the splits
+    root = { 'linkid': list_split[0]['linkid'], 'w': iw, 'h': ih, 'parent': None }
+    panes = { root['linkid']: root }
+    for split in list_split[1:]:
+        cell = panes[split['at']]
+        axis = 'w' if split['split'] == 'h' else 'h'
+        size = translate( split['of'], ww if axis == 'w' else wh, iw if axis == 'w' else ih ) # Includes the divider
+        parent = cell['parent']
+        if not parent or parent['split'] != split['split']:
+            # The pane is replaced by a cell of the same size, which is then split
+            parent = { 'split': split['split'], 'cells': [ cell ], 'w': cell['w'], 'h': cell['h'], 'parent': parent }
+            if cell['parent']: cell['parent']['cells'][cell['parent']['cells'].index(cell)] = parent
+            else: root = parent
+            cell['parent'] = parent
+        new = { 'linkid': split['linkid'], 'w': cell['w'], 'h': cell['h'], 'parent': parent }
+        new[axis] = size - 1
+        cell[axis] -= size
+        if new[axis] < 1 or cell[axis] < 1: return None, []
+        parent['cells'].insert( parent['cells'].index(cell) + 1, new )
+        panes[new['linkid']] = new
+
+    # Render the cells, "{}" for panes side by side, "[]" for panes stacked
+    order = []
+    def render( cell, x, y ):
+        layout = str(cell['w']) + "x" + str(cell['h']) + "," + str(x) + "," + str(y)
+        if not 'cells' in cell:
+            order.append( cell['linkid'] )
+            return layout + "," + str(len(order) - 1)
+        cells = []
+        for child in cell['cells']:
+            cells.append( render( child, x, y ) )
+            if cell['split'] == 'h': x += child['w'] + 1
+            else: y += child['h'] + 1
+        return layout + ( "{" if cell['split'] == 'h' else "[" ) + ",".join(cells) + \
+            ( "}" if cell['split'] == 'h' else "]" )
+    layout = render( root, 0, 0 )
+    return "{:04x},".format( SplitProcessor_LayoutChecksum( layout ) ) + layout, order
+
+def SplitProcessor_LayoutChecksum( layout ):
+    # The checksum that tmux requires at the start of a layout (16 bits)
+    checksum = 0
+    for char in layout:
+        checksum = ( checksum >> 1 ) + ( ( checksum & 1 ) << 15 )
+        checksum = ( checksum + ord(char) ) & 0xffff
+    return checksum
+
+def SplitProcessor_Pack( list_split, ww, wh ): # packed
+    """
+
+    Packs the splits with the windowgram dimensions into a short string, everything SplitProcessor_Layout needs to lay
+    out the window again at another screen size, e.g., "20x6:0h14,0v7,1h4"
+
+    Each split is the number of the pane that was split (its place in the split list), the axis, and the size in the
+    windowgram.
+
+    """
+
+    number = dict( ( split['linkid'], ix ) for ix, split in enumerate(list_split) )
+    return str(ww) + "x" + str(wh) + ":" + \
+        ",".join([ str(number[split['at']]) + split['split'] + str(split['of']) for split in list_split[1:] ])
+
+def SplitProcessor_Unpack( packed ): # list_split, ww, wh
+    """
+
+    Unpacks the string of SplitProcessor_Pack into the split list for SplitProcessor_Layout, with the windowgram
+    dimensions.  Returns None if the string is not valid.
+
+    """
+
+    match = re.match( r"^(\d+)x(\d+):((?:\d+[hv]\d+(?:,\d+[hv]\d+)*)?)$", packed )
+    if not match: return None
+    list_split = [ { 'linkid': 0, 'split': "", 'at': None, 'of': None } ]
+    for split in ( match.group(3).split(",") if match.group(3) else [] ):
+        at, how, of = re.match( r"^(\d+)([hv])(\d+)$", split ).groups()
+        if int(at) >= len(list_split): return None
+        list_split.append( { 'linkid': len(list_split), 'split': how, 'at': int(at), 'of': int(of) } )
+    return list_split, int(match.group(1)), int(match.group(2))
+
+def SplitProcessor_RelayoutFormat( option ): # format
+    """
+
+    The format for "list-windows -F" that SplitProcessor_Relayout reads, where option is the window option that keeps
+    the splits packed by SplitProcessor_Pack
+
+    """
+
+    return "\t".join([ "#{window_id}", "#{window_active}", "#{window_width}", "#{window_height}", "#{window_panes}",
+        "#{window_zoomed_flag}", "#{" + option + "}" ])
+
+def SplitProcessor_Relayout( listing ): # commands
+    """
+
+    Lays out the windows listed by "list-windows -F" (see SplitProcessor_RelayoutFormat) again, returns the tmux
+    commands as argument tuples, a "select-layout" for each window
+
+    tmux resizes the current window only, the others are resized when they're selected.  Every window is laid out at
+    the size of the current window, which resizes them all at once.  A window is skipped if the user has since changed
+    its panes, or zoomed a pane.
+
+    """
+
+    windows = [ data for data in [ line.split("\t") for line in ( listing or "" ).split("\n") ]
+        if len(data) == 7 and data[2].isdigit() and data[3].isdigit() ]
+    window_wh = [ ( int(data[2]), int(data[3]) ) for data in windows if data[1] == "1" ]
+    commands = []
+    for window_id, active, width, height, panes, zoomed, packed in windows:
+        unpacked = SplitProcessor_Unpack( packed ) # Older tmux expands user options to nothing
+        if not unpacked or str(len(unpacked[0])) != panes or zoomed == "1": continue
+        list_split, ww, wh = unpacked
+        width, height = window_wh[0] if window_wh else ( int(width), int(height) )
+        layout, order = SplitProcessor_Layout( list_split, ww, wh, width, height )
+        if layout: commands.append( ( "select-layout", "-t", window_id, layout ) )
+    return commands
+
+
+
+##----------------------------------------------------------------------------------------------------------------------
+##
+## Hook of tmuxomatic --resize, run as: windowgram_layout.py <tmux> <option> <session>
+##
+##----------------------------------------------------------------------------------------------------------------------
+
+if __name__ == "__main__":
+
+    tmux, option, session = sys.argv[1:4]
+    listing = subprocess.run( [ tmux, "list-windows", "-t", session, "-F", SplitProcessor_RelayoutFormat( option ) ],
+        stdout=subprocess.PIPE, stderr=subprocess.DEVNULL ).stdout
+    argv = [ tmux ]
+    for command in SplitProcessor_Relayout( str(listing, "utf-8", "replace") ):
+        argv += ( [ ";" ] if len(argv) > 1 else [] ) + list(command)
+    if len(argv) > 1:
+        subprocess.call( argv, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL )
@@ -66,7 +66,7 @@ OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMA
 ##
 ##----------------------------------------------------------------------------------------------------------------------
 
-import unittest, io, inspect, sys
+import unittest, io, inspect, sys, re
 
 from windowgram import *
 
@@ -389,6 +389,126 @@ class Test_WindowgramGroup_Convert(SenseTestCase):
 
 
 
+##----------------------------------------------------------------------------------------------------------------------
+##
+## Unit Testing :: SplitProcessor
+##
+##----------------------------------------------------------------------------------------------------------------------
+
+class Test_SplitProcessor(SenseTestCase):
+
+    def split(self, windowgram, iw, ih): # -> list_split, list_links, windowgram_w, windowgram_h
+        wg = Windowgram( windowgram )
+        parsed = wg.Export_Parsed()
+        for pane in parsed.keys(): parsed[pane]['l'] = 0
+        list_panes, _ = Windowgram_Miscellaneous.SortPanes( parsed )
+        sw = { 'print': None, 'verbose': 0, 'relative': False, 'scanline': False }
+        list_split, list_links = SplitProcessor( sw, wg, iw, ih, list_panes )
+        return ( list_split, list_links ) + tuple( wg.Analyze_WidthHeight() )
+
+    def test_SplitProcessor_LayoutChecksum(self):
+        # Layout as reported by tmux, after "split-window -h" then "split-window -v"
+        data_i = "150x39,0,0{75x39,0,0,0,74x39,76,0[74x19,76,0,1,74x19,76,20,2]}"
+        self.assertTrue( SplitProcessor_LayoutChecksum( data_i ) == 0xc1a6 )
+
+    def test_SplitProcessor_Layout(self):
+        list_split, list_links, ww, wh = self.split( "1135\n1145\n2245\n", 40, 12 )
+        layout, order = SplitProcessor_Layout( list_split, ww, wh, 40, 12 )
+        self.assertTrue( layout == "afdc,40x12,0,0{20x12,0,0[20x8,0,0,0,20x3,0,9,1],9x12,21,0[9x4,21,0,2," + \
+            "9x7,21,5,3],9x12,31,0,4}" )
+        # The panes are in the same order as the pane indexes of the split processor
+        self.assertTrue( order == [ linkid for linkid, _ in sorted( list_links, key=lambda link: link[1] ) ] )
+        # Screen too small
+        layout, order = SplitProcessor_Layout( list_split, ww, wh, 40, 2 )
+        self.assertTrue( layout is None )
+
+    def test_SplitProcessor_Layout_Tmux(self):
+        # Same geometry as tmux made from the splits of session_demo (pane ids are replaced by the order of the panes)
+        windowgram = "AAAAAAvvvvvXXXXXTTTT\njjjQQQQQQQuuuuuuTTTT\njjjQQQQQQQuuuuuuTTTT\n" + \
+            "jjjQQQQQQQuuuuuuTTTT\n0000llllllllllaaaaaa\n1234llllllllllaaaaaa\n"
+        list_split, list_links, ww, wh = self.split( windowgram, 150, 40 )
+        layout, order = SplitProcessor_Layout( list_split, ww, wh, 150, 40 )
+        self.assertTrue( layout == "aa61,150x40,0,0[150x27,0,0{120x27,0,0[120x7,0,0{45x7,0,0,0,37x7,46,0,1," + \
+            "36x7,84,0,2},120x19,0,8{23x19,0,8,3,51x19,24,8,4,44x19,76,8,5}],29x27,121,0,6},150x12,0,28{30x12,0," + \
+            "28[30x6,0,28,7,30x5,0,35{8x5,0,35,8,6x5,9,35,9,7x5,16,35,10,6x5,24,35,11}],74x12,31,28,12,44x12,106," + \
+            "28,13}]" )
+
+    def test_SplitProcessor_Pack(self):
+        list_split, list_links, ww, wh = self.split( "1135\n1145\n2245\n", 40, 12 )
+        packed = SplitProcessor_Pack( list_split, ww, wh )
+        self.assertTrue( packed == "4x3:0h2,0v1,1h1,1v2" )
+        # The unpacked splits lay out the same window
+        list_unpacked, ww, wh = SplitProcessor_Unpack( packed )
+        self.assertTrue( SplitProcessor_Layout( list_unpacked, ww, wh, 80, 24 )[0] == \
+            SplitProcessor_Layout( list_split, ww, wh, 80, 24 )[0] )
+        # Single pane, and invalid
+        self.assertTrue( SplitProcessor_Unpack( "1x1:" ) == ( [ { 'linkid': 0, 'split': "", 'at': None, 'of': None } ],
+            1, 1 ) )
+        self.assertTrue( SplitProcessor_Unpack( "" ) is None )
+        self.assertTrue( SplitProcessor_Unpack( "4x3:1h2" ) is None )
+
+    def test_SplitProcessor_Relayout(self):
+        list_split, list_links, ww, wh = self.split( "1135\n1145\n2245\n", 40, 12 )
+        packed = SplitProcessor_Pack( list_split, ww, wh )
+        self.assertTrue( SplitProcessor_RelayoutFormat( "@splits" ).endswith( "\t#{@splits}" ) )
+        # Every window is laid out at the size of the active window, unless its panes have changed, or it's zoomed
+        listing = "@1\t0\t40\t12\t5\t0\t" + packed + "\n@2\t1\t80\t24\t5\t0\t" + packed + "\n" + \
+            "@3\t0\t40\t12\t4\t0\t" + packed + "\n@4\t0\t40\t12\t5\t1\t" + packed + "\n@5\t0\t40\t12\t1\t0\t\n"
+        layout, order = SplitProcessor_Layout( list_split, ww, wh, 80, 24 )
+        self.assertTrue( SplitProcessor_Relayout( listing ) == [ ( "select-layout", "-t", "@1", layout ),
+            ( "select-layout", "-t", "@2", layout ) ] )
+        self.assertTrue( SplitProcessor_Relayout( "" ) == [] )
+
+    def test_SplitProcessor_Percentages(self):
+        list_split, list_links, ww, wh = self.split( "1135\n1145\n2245\n", 40, 12 )
+        self.assertTrue( SplitProcessor_Percentages( list_split, ww, wh, 40, 12 ) == [ 48, 25, 48, 59 ] )
+        # Nested splits don't drift, every edge is within a character of the windowgram edge scaled to the screen
+        list_split, list_links, ww, wh = self.split( PANE_CHARACTERS[1:36] + "\n", 200, 10 )
+        percentages = SplitProcessor_Percentages( list_split, ww, wh, 200, 10 )
+        x, size = 0, 200
+        for pane, percentage in enumerate( percentages, 1 ):
+            size_new = size * percentage // 100 # As split by tmux
+            x, size = x + size - size_new, size_new
+            self.assertTrue( abs( x - ( int( pane * 200 / 35.0 + 0.5 ) + 1 ) ) <= 1 )
+        # Screen too small
+        self.assertTrue( SplitProcessor_Percentages( list_split, ww, wh, 60, 10 ) is None )
+
+    def test_SplitProcessor_Create(self):
+        splits, made = SplitProcessor_Create( 5, 40, 12 )
+        self.assertTrue( splits == [ ( 0, 'h' ), ( 0, 'v' ), ( 2, 'v' ), ( 0, 'h' ) ] )
+        self.assertTrue( made == [ 0, 4, 2, 1, 3 ] )
+        # Every pane of the largest windowgram fits
+        splits, made = SplitProcessor_Create( MAXIMUM_PANES, 80, 24 )
+        self.assertTrue( len(splits) == MAXIMUM_PANES - 1 and sorted(made) == list(range(MAXIMUM_PANES)) )
+        # Screen too small
+        splits, made = SplitProcessor_Create( 5, 3, 1 )
+        self.assertTrue( splits is None )
+
+    def test_SplitProcessor_Capture(self):
+        def panes(layout): # -> [ ( x, y, w, h ), ... ] from the panes of a tmux layout
+            return [ ( int(x), int(y), int(w), int(h) ) for w, h, x, y, _ in
+                re.findall( r"(\d+)x(\d+),(\d+),(\d+),(\d+)", layout ) ]
+        # The window of a windowgram is captured as the same windowgram, with the pane ids in reading order
+        list_split, list_links, ww, wh = self.split( "1135\n1145\n2245\n", 40, 12 )
+        layout, order = SplitProcessor_Layout( list_split, ww, wh, 40, 12 )
+        windowgram, paneids = SplitProcessor_Capture( panes(layout), 40, 12, 60 )
+        self.assertTrue( windowgram == "1123\n1143\n5543\n" )
+        self.assertTrue( paneids == [ '1', '5', '2', '4', '3' ] )
+        # Edges that share a divisor are reduced by it
+        self.assertTrue( SplitProcessor_Capture( [ ( 0, 0, 9, 5 ), ( 10, 0, 9, 5 ) ], 19, 5, 60 )[0] == "12\n" )
+        # At a lower resolution the windowgram is smaller, within half a windowgram character of the edges
+        windowgram = "AAAAAAvvvvvXXXXXTTTT\njjjQQQQQQQuuuuuuTTTT\njjjQQQQQQQuuuuuuTTTT\n" + \
+            "jjjQQQQQQQuuuuuuTTTT\n0000llllllllllaaaaaa\n1234llllllllllaaaaaa\n"
+        list_split, list_links, ww, wh = self.split( windowgram, 150, 40 )
+        layout, order = SplitProcessor_Layout( list_split, ww, wh, 150, 40 )
+        windowgram, paneids = SplitProcessor_Capture( panes(layout), 150, 40, 6 )
+        self.assertTrue( windowgram == "111112222233334444\n555666666777774444\n555666666777774444\n" + \
+            "888899999999900000\nabcd99999999900000\n" )
+        # Too many panes
+        self.assertTrue( SplitProcessor_Capture( [ ( 0, 0, 1, 1 ) ] * ( MAXIMUM_PANES + 1 ), 80, 24, 60 )[0] is None )
+
+
+
 ##----------------------------------------------------------------------------------------------------------------------
 ##
 ## Unit Testing :: Flex Cores